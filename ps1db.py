@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 import click
 from tabulate import tabulate
-from sqlalchemy import create_engine, or_, func, Column, Integer, String, Boolean
+from sqlalchemy import (create_engine, event, text, select, table, column, and_, or_, case, func,
+                        Column, Integer, String, Boolean)
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 import os
+import re
 import sys
 from datetime import datetime
-import glob
+from functools import cached_property, lru_cache
+from itertools import islice
 
 # Database setup
 def get_user_data_dir():
@@ -28,28 +33,85 @@ POSSIBLE_DB_LOCATIONS = [
     os.path.join(os.getcwd(), "ps1_games.db")  # Current directory
 ]
 
-# Find the game database
-GAME_DB_PATH = None
-for path in POSSIBLE_DB_LOCATIONS:
-    if os.path.exists(path):
-        GAME_DB_PATH = path
-        break
-
-if not GAME_DB_PATH:
+def find_game_db():
+    """Find the game database, exiting with an error if it isn't installed"""
+    for path in POSSIBLE_DB_LOCATIONS:
+        if os.path.exists(path):
+            return path
+    
     click.echo("Error: Could not find game database. Checked locations:", err=True)
     for path in POSSIBLE_DB_LOCATIONS:
         click.echo(f"  - {path}", err=True)
     sys.exit(1)
 
-USER_DB_PATH = os.path.join(get_user_data_dir(), "user_collection.db")
+# Per-connection SQLite tuning: 64MB page cache, 256MB memory-mapped I/O
+# and in-memory temp tables. The game database ships read-only with the
+# package, so it keeps its default journal mode.
+GAME_DB_PRAGMAS = (
+    "cache_size=-65536",
+    "mmap_size=268435456",
+    "temp_store=MEMORY",
+)
+
+# The collection database is written by scan, so it also uses WAL with
+# NORMAL sync (fewer fsyncs per commit). WAL persists in the database file
+# and creates user_collection.db-wal/-shm files alongside it.
+USER_DB_PRAGMAS = GAME_DB_PRAGMAS + (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+)
+
+def apply_pragmas(engine, pragmas):
+    """Run the given PRAGMA statements on every new connection of engine"""
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+# Database engines are created on first use rather than at import, so --help
+# never locates databases, creates the data directory or builds engines.
+# QueuePool keeps connections (with their PRAGMAs and warm page cache) open
+# for reuse across sessions; SQLAlchemy 1.4 otherwise defaults file databases
+# to NullPool and reconnects every time.
+@lru_cache(maxsize=None)
+def get_game_engine():
+    """Create the game database engine, once per process"""
+    engine = create_engine(f"sqlite:///{find_game_db()}", poolclass=QueuePool)
+    apply_pragmas(engine, GAME_DB_PRAGMAS)
+    return engine
+
+@lru_cache(maxsize=None)
+def get_user_engine():
+    """Create the user collection engine and its tables, once per process"""
+    user_db_path = os.path.join(get_user_data_dir(), "user_collection.db")
+    engine = create_engine(f"sqlite:///{user_db_path}", poolclass=QueuePool)
+    apply_pragmas(engine, USER_DB_PRAGMAS)
+    init_db(engine)
+    return engine
+
+GameSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+UserSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+def get_game_session():
+    """Open a session on the game database"""
+    return GameSessionLocal(bind=get_game_engine())
+
+def get_user_session():
+    """Open a session on the user collection database"""
+    return UserSessionLocal(bind=get_user_engine())
 
-# Create database engines
-game_engine = create_engine(f"sqlite:///{GAME_DB_PATH}")
-user_engine = create_engine(f"sqlite:///{USER_DB_PATH}")
-GameSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=game_engine)
-UserSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=user_engine)
 Base = declarative_base()
 
+# Per region: display code, Game availability flag, UserGame ownership flag
+# and UserGame path column
+REGION_LABELS = (
+    ('JP', 'region_jp', 'has_jp_version', 'jp_path'),
+    ('EU', 'region_eu', 'has_eu_version', 'eu_path'),
+    ('NA', 'region_na', 'has_na_version', 'na_path'),
+)
+
 class Game(Base):
     __tablename__ = "games"
 
@@ -69,26 +131,12 @@ class Game(Base):
     notes = Column(String)
 
     def __repr__(self):
-        regions = []
-        if self.region_jp:
-            regions.append("JP")
-        if self.region_eu:
-            regions.append("EU")
-        if self.region_na:
-            regions.append("NA")
-        return f"<Game {self.title} ({', '.join(regions)})>"
-
-    @property
+        return f"<Game {self.title} ({self.region})>"
+
+    @cached_property
     def region(self):
-        """Helper property to get regions as a string"""
-        regions = []
-        if self.region_jp:
-            regions.append("JP")
-        if self.region_eu:
-            regions.append("EU")
-        if self.region_na:
-            regions.append("NA")
-        return ", ".join(regions)
+        """Helper property to get regions as a string, computed once per instance"""
+        return ", ".join(name for name, flag, _, _ in REGION_LABELS if getattr(self, flag))
 
 class UserGame(Base):
     """Model for tracking user's local game collection"""
@@ -105,14 +153,104 @@ class UserGame(Base):
     eu_path = Column(String, nullable=True)
     na_path = Column(String, nullable=True)
 
-def init_db():
+# Columns needed to list or match games. Querying these directly returns
+# lightweight rows instead of fully hydrated Game instances.
+GAME_LISTING_COLUMNS = (
+    Game.id,
+    Game.title,
+    Game.serial_number,
+    Game.developer,
+    Game.publisher,
+    Game.region_jp,
+    Game.region_eu,
+    Game.region_na,
+)
+
+# Max ids per IN (...) clause; older SQLite builds cap bound parameters at 999
+SQLITE_IN_BATCH_SIZE = 500
+
+def count_where(*conditions):
+    """Aggregate counting the rows that match all conditions"""
+    return func.sum(case((and_(*conditions), 1), else_=0))
+
+# Full-text index over the searchable game columns, shipped inside the game
+# database. It uses the trigram tokenizer, so a phrase MATCH is a
+# case-insensitive substring match: the same rows as ILIKE '%term%', found
+# through the index instead of a full table scan. It is contentless (only
+# rowids = games.id come back) and kept in sync with games by triggers.
+# The CLI never writes it; build-search-index creates it when the game
+# database is produced.
+GAMES_FTS_DROP = (
+    "DROP TRIGGER IF EXISTS games_fts_insert",
+    "DROP TRIGGER IF EXISTS games_fts_delete",
+    "DROP TRIGGER IF EXISTS games_fts_update",
+    "DROP TABLE IF EXISTS games_fts",
+)
+GAMES_FTS_SCHEMA = (
+    """CREATE VIRTUAL TABLE games_fts USING fts5(
+        title, developer, publisher, serial_number, content='', tokenize='trigram'
+    )""",
+    """INSERT INTO games_fts(rowid, title, developer, publisher, serial_number)
+        SELECT id, title, developer, publisher, serial_number FROM games""",
+    """CREATE TRIGGER games_fts_insert AFTER INSERT ON games BEGIN
+        INSERT INTO games_fts(rowid, title, developer, publisher, serial_number)
+        VALUES (new.id, new.title, new.developer, new.publisher, new.serial_number);
+    END""",
+    """CREATE TRIGGER games_fts_delete AFTER DELETE ON games BEGIN
+        INSERT INTO games_fts(games_fts, rowid, title, developer, publisher, serial_number)
+        VALUES ('delete', old.id, old.title, old.developer, old.publisher, old.serial_number);
+    END""",
+    """CREATE TRIGGER games_fts_update AFTER UPDATE ON games BEGIN
+        INSERT INTO games_fts(games_fts, rowid, title, developer, publisher, serial_number)
+        VALUES ('delete', old.id, old.title, old.developer, old.publisher, old.serial_number);
+        INSERT INTO games_fts(rowid, title, developer, publisher, serial_number)
+        VALUES (new.id, new.title, new.developer, new.publisher, new.serial_number);
+    END""",
+)
+games_fts = table("games_fts", column("rowid"), column("games_fts"))
+
+# Trigram queries need at least this many characters to use the index
+FTS_MIN_TERM_LENGTH = 3
+
+def init_db(engine):
     """Create tables if they don't exist"""
-    Base.metadata.create_all(bind=user_engine)
+    Base.metadata.create_all(bind=engine)
+
+@lru_cache(maxsize=None)
+def has_search_index():
+    """Check once per process whether the games_fts index can be queried.
+
+    Probes with a real MATCH, so a missing table, a SQLite without FTS5 or
+    without the trigram tokenizer (added in 3.34) all return False and
+    callers fall back to LIKE.
+    """
+    probe = select(games_fts.c.rowid).where(games_fts.c.games_fts.match(fts_phrase("ps1"))).limit(1)
+    try:
+        with get_game_engine().connect() as conn:
+            conn.execute(probe).all()
+    except OperationalError:
+        return False
+    return True
+
+def fts_phrase(term):
+    """Quote term as a single FTS5 phrase"""
+    return '"' + term.replace('"', '""') + '"'
+
+def contains_filter(term, columns):
+    """Filter for games where any of the given columns contains term, ignoring case.
+
+    Uses the games_fts index when possible, otherwise ILIKE '%term%'.
+    """
+    if len(term) >= FTS_MIN_TERM_LENGTH and has_search_index():
+        names = " ".join(c.key for c in columns)
+        return Game.id.in_(
+            select(games_fts.c.rowid).where(games_fts.c.games_fts.match(f"{{{names}}}: {fts_phrase(term)}"))
+        )
+    return or_(*(c.ilike(f"%{term}%") for c in columns))
 
 @click.group()
 def main():
     """PlayStation 1 Game Database Tool"""
-    init_db()
     pass
 
 @main.command()
@@ -125,17 +263,15 @@ def search(search_term=None, region=None, local=False):
         click.echo("\nTip: Try searching with part of the name (e.g., 'crash' instead of 'Crash Bandicoot')")
         click.echo("     This often helps find games that might have different regional titles.\n")
     
-    game_db = GameSessionLocal()
-    user_db = UserSessionLocal()
+    game_db = get_game_session()
+    user_db = get_user_session()
     try:
-        query = game_db.query(Game)
+        query = game_db.query(*GAME_LISTING_COLUMNS)
         
         if search_term:
-            search_filter = or_(
-                Game.title.ilike(f"%{search_term}%"),
-                Game.developer.ilike(f"%{search_term}%"),
-                Game.publisher.ilike(f"%{search_term}%"),
-                Game.serial_number.ilike(f"%{search_term}%")
+            search_filter = contains_filter(
+                search_term,
+                (Game.title, Game.developer, Game.publisher, Game.serial_number)
             )
             query = query.filter(search_filter)
         
@@ -147,36 +283,42 @@ def search(search_term=None, region=None, local=False):
             elif region.upper() == 'NA':
                 query = query.filter(Game.region_na == 1)
             
-        games = query.all()
+        # Prepare table data, streaming matches from the cursor in batches so
+        # only the rendered rows are kept in memory
+        table_data = []
+        games = iter(query.yield_per(SQLITE_IN_BATCH_SIZE))
+        while True:
+            batch = list(islice(games, SQLITE_IN_BATCH_SIZE))
+            if not batch:
+                break
+            
+            # Get local collection info for this batch of matches only
+            # (batched, see SQLITE_IN_BATCH_SIZE)
+            local_games = {
+                user_game.game_id: user_game
+                for user_game in user_db.query(UserGame).filter(UserGame.game_id.in_([g.id for g in batch]))
+            }
+            
+            for g in batch:
+                user_game = local_games.get(g.id)
+                regions = [
+                    f"{name} {'✓' if user_game and getattr(user_game, owned) else '✗'}"
+                    for name, flag, owned, _ in REGION_LABELS if getattr(g, flag)
+                ]
+                
+                table_data.append([
+                    g.title,
+                    g.serial_number,
+                    g.developer,
+                    g.publisher,
+                    ' | '.join(regions)
+                ])
         
-        if not games:
+        if not table_data:
             click.echo("No games found matching your criteria.")
             click.echo("\nTip: Try using a shorter, unique part of the title")
             click.echo("     For example: 'metal' instead of 'Metal Gear Solid'")
             return
-
-        # Get local collection info
-        local_games = {g.game_id: g for g in user_db.query(UserGame).all()}
-        
-        # Prepare table data
-        table_data = []
-        for g in games:
-            user_game = local_games.get(g.id)
-            regions = []
-            if g.region_jp:
-                regions.append(f"JP {'✓' if user_game and user_game.has_jp_version else '✗'}")
-            if g.region_eu:
-                regions.append(f"EU {'✓' if user_game and user_game.has_eu_version else '✗'}")
-            if g.region_na:
-                regions.append(f"NA {'✓' if user_game and user_game.has_na_version else '✗'}")
-            
-            table_data.append([
-                g.title,
-                g.serial_number,
-                g.developer,
-                g.publisher,
-                ' | '.join(regions)
-            ])
         
         # Print results in a nice table
         click.echo(tabulate(
@@ -185,7 +327,7 @@ def search(search_term=None, region=None, local=False):
             tablefmt='grid'
         ))
         
-        click.echo(f"\nFound {len(games)} games")
+        click.echo(f"\nFound {len(table_data)} games")
         
     finally:
         game_db.close()
@@ -194,21 +336,35 @@ def search(search_term=None, region=None, local=False):
 @main.command()
 def stats():
     """Show statistics about your PS1 collection"""
-    game_db = GameSessionLocal()
-    user_db = UserSessionLocal()
+    game_db = get_game_session()
+    user_db = get_user_session()
     try:
-        total_games = game_db.query(Game).count()
-        total_local = user_db.query(UserGame).count()
+        # Get local collection stats
+        local_rows = user_db.query(UserGame.game_id).all()
+        total_local = len(local_rows)
+        local_game_ids = list({row.game_id for row in local_rows})
         
-        jp_games = game_db.query(Game).filter(Game.region_jp == 1).count()
-        eu_games = game_db.query(Game).filter(Game.region_eu == 1).count()
-        na_games = game_db.query(Game).filter(Game.region_na == 1).count()
+        # Count the whole database in a single pass over the games table
+        total_games, jp_games, eu_games, na_games = (count or 0 for count in game_db.query(
+            func.count(),
+            count_where(Game.region_jp == 1),
+            count_where(Game.region_eu == 1),
+            count_where(Game.region_na == 1),
+        ).one())
         
-        # Get local collection stats
-        local_game_ids = {g.game_id for g in user_db.query(UserGame).all()}
-        jp_owned = game_db.query(Game).filter(Game.id.in_(local_game_ids), Game.region_jp == 1).count()
-        eu_owned = game_db.query(Game).filter(Game.id.in_(local_game_ids), Game.region_eu == 1).count()
-        na_owned = game_db.query(Game).filter(Game.id.in_(local_game_ids), Game.region_na == 1).count()
+        # Count owned games per region, one aggregate per batch of ids
+        # (batched, see SQLITE_IN_BATCH_SIZE)
+        jp_owned = eu_owned = na_owned = 0
+        for start in range(0, len(local_game_ids), SQLITE_IN_BATCH_SIZE):
+            batch = local_game_ids[start:start + SQLITE_IN_BATCH_SIZE]
+            jp, eu, na = (count or 0 for count in game_db.query(
+                count_where(Game.region_jp == 1),
+                count_where(Game.region_eu == 1),
+                count_where(Game.region_na == 1),
+            ).filter(Game.id.in_(batch)).one())
+            jp_owned += jp
+            eu_owned += eu
+            na_owned += na
         
         click.echo(f"\nTotal Games in Database: {total_games}")
         click.echo(f"Games in Your Collection: {total_local}")
@@ -221,6 +377,12 @@ def stats():
         game_db.close()
         user_db.close()
 
+# Most candidates listed per manual-match search
+MANUAL_MATCH_LIMIT = 50
+
+# Region codes accepted by the manual-match prompt, built once
+REGION_CHOICE = click.Choice([name for name, *_ in REGION_LABELS], case_sensitive=False)
+
 def manual_match(game_db, user_db, unmatched_files):
     """Interactive function to manually match unmatched games"""
     if not unmatched_files:
@@ -244,14 +406,13 @@ def manual_match(game_db, user_db, unmatched_files):
             if title.lower() == 'skip':
                 break
             
-            # Search for matches
+            # Search for matches, capped so a short title can't flood the list
             matches = game_db.query(Game).filter(
-                or_(
-                    Game.title.ilike(f"%{title}%"),
-                    Game.title.ilike(f"{title}%"),
-                    Game.title.ilike(f"%{title}")
-                )
-            ).all()
+                contains_filter(title, (Game.title,))
+            ).limit(MANUAL_MATCH_LIMIT + 1).all()
+            # One extra row is fetched only to tell whether the list was cut off
+            truncated = len(matches) > MANUAL_MATCH_LIMIT
+            matches = matches[:MANUAL_MATCH_LIMIT]
             
             if not matches:
                 click.echo("No matches found. Try a different title.")
@@ -261,11 +422,9 @@ def manual_match(game_db, user_db, unmatched_files):
             # Show matches
             click.echo("\nPotential matches:")
             for idx, game in enumerate(matches, 1):
-                regions = []
-                if game.region_jp: regions.append("JP")
-                if game.region_eu: regions.append("EU")
-                if game.region_na: regions.append("NA")
-                click.echo(f"{idx}. {game.title} ({', '.join(regions)})")
+                click.echo(f"{idx}. {game.title} ({game.region})")
+            if truncated:
+                click.echo(f"(Showing the first {MANUAL_MATCH_LIMIT} matches - try a longer title to narrow them down)")
             click.echo("0. None of these - try again")
             
             # Get user choice
@@ -279,21 +438,18 @@ def manual_match(game_db, user_db, unmatched_files):
                 
                 # Get region from user
                 click.echo("\nAvailable regions for this game:")
-                available_regions = []
-                if game.region_jp: available_regions.append("JP")
-                if game.region_eu: available_regions.append("EU")
-                if game.region_na: available_regions.append("NA")
-                click.echo(f"Regions: {', '.join(available_regions)}")
+                click.echo(f"Regions: {game.region}")
                 
                 region = click.prompt(
                     "Enter the region code for your version (JP/EU/NA)",
-                    type=click.Choice(['JP', 'EU', 'NA'], case_sensitive=False)
+                    type=REGION_CHOICE
                 ).upper()
                 
                 # Verify region is valid for this game
-                if (region == 'JP' and not game.region_jp) or \
-                   (region == 'EU' and not game.region_eu) or \
-                   (region == 'NA' and not game.region_na):
+                _, flag, owned, path_column = next(
+                    labels for labels in REGION_LABELS if labels[0] == region
+                )
+                if not getattr(game, flag):
                     click.echo(f"Error: This game is not available in {region} region.")
                     continue
                 
@@ -311,114 +467,165 @@ def manual_match(game_db, user_db, unmatched_files):
                     user_db.add(user_game)
                 
                 # Update region-specific flags and paths
-                if region == 'JP':
-                    user_game.has_jp_version = True
-                    user_game.jp_path = file_path
-                elif region == 'EU':
-                    user_game.has_eu_version = True
-                    user_game.eu_path = file_path
-                else:  # NA
-                    user_game.has_na_version = True
-                    user_game.na_path = file_path
+                setattr(user_game, owned, True)
+                setattr(user_game, path_column, file_path)
                 
                 user_db.commit()
                 click.echo(f"Successfully matched: {game.title} ({region})")
                 break
 
+# File extensions treated as PS1 disc images
+GAME_FILE_EXTENSIONS = ('.bin', '.iso', '.img')
+
+# Substrings of an upper-cased filename that mark its region
+JP_TOKENS = ('JPN', 'JAP', '(J)')
+PAL_TOKENS = ('PAL', 'EUR', '(E)')
+NA_TOKENS = ('USA', 'NA', '(U)')
+
+# Region indicators and disc numbers stripped from filenames before matching,
+# either wrapped in parentheses or as whole words (so 'NA' in 'FINAL' stays)
+CLEAN_NAME_RE = re.compile(
+    r'\((?:J|E|U|PAL|EUR|USA|JPN|JAP|DIS[CK] ?[12]|ARCADE MODE|SIMULATION MODE)\)'
+    r'|\b(?:JPN|JAP|PAL|EUR|USA|NA|DIS[CK] ?[12])\b',
+    re.IGNORECASE
+)
+
+def find_game_files(directory):
+    """Walk directory once with os.scandir, yielding paths of PS1 disc images"""
+    pending = [directory]
+    visited = set()  # (st_dev, st_ino) of every directory walked, so symlink loops end
+    while pending:
+        path = pending.pop()
+        try:
+            info = os.stat(path)
+            if (info.st_dev, info.st_ino) in visited:
+                continue
+            visited.add((info.st_dev, info.st_ino))
+            entries = os.scandir(path)
+        except OSError:
+            continue  # Unreadable directory, skip it like glob does
+        with entries:
+            for entry in entries:
+                # Hidden files and directories are skipped, matching glob
+                if entry.name.startswith('.'):
+                    continue
+                # Symlinked directories are followed, like glob does
+                if entry.is_dir():
+                    pending.append(entry.path)
+                elif entry.name.lower().endswith(GAME_FILE_EXTENSIONS) and entry.is_file():
+                    yield entry.path
+
 @main.command()
 @click.argument('directory', type=click.Path(exists=True))
 def scan(directory):
     """Scan a directory for PS1 games and update your collection"""
-    game_db = GameSessionLocal()
-    user_db = UserSessionLocal()
+    game_db = get_game_session()
+    user_db = get_user_session()
     try:
         # Look for .bin, .iso, and .img files
-        patterns = ['*.bin', '*.iso', '*.img']
-        found_files = []
-        for pattern in patterns:
-            found_files.extend(glob.glob(os.path.join(directory, '**', pattern), recursive=True))
+        found_files = list(find_game_files(directory))
         
         if not found_files:
             click.echo("No PS1 game files found in the specified directory.")
             return
         
+        # Load the games table once and match every file against it in memory
+        # instead of issuing one or two queries per file
+        games_by_title = {}
+        lowered_titles = []
+        for game in game_db.query(*GAME_LISTING_COLUMNS):
+            title = game.title.lower()
+            games_by_title.setdefault(title, []).append(game)
+            lowered_titles.append((title, game))
+        
         unmatched_files = []
             
-        # Update database with found files
-        for file_path in found_files:
-            # Get game name from filename
-            filename = os.path.splitext(os.path.basename(file_path))[0]
+        # Stage every automatic match in one transaction, committed once at the end
+        with user_db.begin():
+            # Index the existing collection once instead of querying per file.
+            # Entries are plain column dicts, written back below as bulk mappings.
+            user_games = {
+                row.game_id: row._asdict()
+                for row in user_db.query(*UserGame.__table__.columns)
+            }
+            new_user_games = []
+            updated_user_games = {}
+            
+            for file_path in found_files:
+                # Get game name from filename
+                filename = os.path.splitext(os.path.basename(file_path))[0]
             
-            # Check for region indicators in filename
-            is_jp = any(jp in filename.upper() for jp in ['JPN', 'JAP', '(J)'])
-            is_pal = any(pal in filename.upper() for pal in ['PAL', 'EUR', '(E)'])
-            is_na = any(na in filename.upper() for na in ['USA', 'NA', '(U)']) or (not is_jp and not is_pal)
+                # Check for region indicators in filename
+                filename_upper = filename.upper()
+                is_jp = any(token in filename_upper for token in JP_TOKENS)
+                is_pal = any(token in filename_upper for token in PAL_TOKENS)
+                is_na = any(token in filename_upper for token in NA_TOKENS) or (not is_jp and not is_pal)
+                detected = {'JP': is_jp, 'EU': is_pal, 'NA': is_na}
             
-            # Remove common region indicators and disc numbers for better matching
-            clean_name = filename.upper()
-            for indicator in ['JPN', 'JAP', 'PAL', 'EUR', 'USA', 'NA', '(J)', '(E)', '(U)',
-                            'DISC 1', 'DISC 2', 'DISK 1', 'DISK 2', 'DISC1', 'DISC2',
-                            '(DISC 1)', '(DISC 2)', '(DISK 1)', '(DISK 2)',
-                            '(PAL)', '(USA)', '(JPN)', '(JAP)',
-                            '(ARCADE MODE)', '(SIMULATION MODE)']:
-                clean_name = clean_name.replace(indicator, '').strip()
+                # Remove common region indicators and disc numbers for better matching.
+                # Underscores become spaces first so word boundaries apply to them.
+                clean_name = filename_upper.replace("_", " ")
+                clean_name = CLEAN_NAME_RE.sub('', clean_name)
             
-            # Handle special characters and normalize spaces
-            clean_name = clean_name.replace(":", "").replace("_", " ")
-            clean_name = " ".join(clean_name.split())  # Normalize multiple spaces to single space
-            clean_name = clean_name.strip()
+                # Handle special characters and normalize spaces
+                clean_name = clean_name.replace(":", "")
+                clean_name = " ".join(clean_name.split())  # Normalize multiple spaces to single space
             
-            # Try exact match first
-            exact_matches = game_db.query(Game).filter(func.lower(Game.title) == clean_name.lower())
+                # Try exact match first
+                match_key = clean_name.lower()
+                games = games_by_title.get(match_key, [])
             
-            if exact_matches.count() > 0:
-                games = exact_matches.all()
-            else:
-                # Fall back to partial match
-                games = game_db.query(Game).filter(Game.title.ilike(f"%{clean_name}%")).all()
+                if not games:
+                    # Fall back to partial match
+                    games = [game for title, game in lowered_titles if match_key in title]
             
-            if games:
-                if len(games) == 1:
-                    # Exact match found
-                    game = games[0]
-                    # Update or create user game entry
-                    user_game = user_db.query(UserGame).filter_by(game_id=game.id).first()
-                    if not user_game:
-                        user_game = UserGame(
-                            game_id=game.id,
-                            title=game.title,
-                            serial_number=game.serial_number,
-                            has_jp_version=False,
-                            has_eu_version=False,
-                            has_na_version=False
-                        )
-                        user_db.add(user_game)
+                if games:
+                    if len(games) == 1:
+                        # Exact match found
+                        game = games[0]
+                        # Update or create user game entry
+                        user_game = user_games.get(game.id)
+                        if not user_game:
+                            user_game = dict(
+                                game_id=game.id,
+                                title=game.title,
+                                serial_number=game.serial_number,
+                                has_jp_version=False,
+                                has_eu_version=False,
+                                has_na_version=False
+                            )
+                            new_user_games.append(user_game)
+                            user_games[game.id] = user_game
+                        elif 'id' in user_game:
+                            # Existing row; entries created earlier in this scan
+                            # are still pending in new_user_games
+                            updated_user_games[user_game['id']] = user_game
                     
-                    # Update region-specific paths and flags
-                    if is_jp and game.region_jp:
-                        user_game.has_jp_version = True
-                        user_game.jp_path = file_path
-                    elif is_pal and game.region_eu:
-                        user_game.has_eu_version = True
-                        user_game.eu_path = file_path
-                    elif is_na and game.region_na:
-                        user_game.has_na_version = True
-                        user_game.na_path = file_path
+                        # Update region-specific paths and flags for the first
+                        # detected region the game exists in, in REGION_LABELS order
+                        for region, flag, owned, path_column in REGION_LABELS:
+                            if detected[region] and getattr(game, flag):
+                                user_game[owned] = True
+                                user_game[path_column] = file_path
+                                break
                     
-                    regions = []
-                    if game.region_jp: regions.append(f"JP {'✓' if user_game.has_jp_version else '✗'}")
-                    if game.region_eu: regions.append(f"EU {'✓' if user_game.has_eu_version else '✗'}")
-                    if game.region_na: regions.append(f"NA {'✓' if user_game.has_na_version else '✗'}")
-                    click.echo(f"Updated: {game.title} ({', '.join(regions)})")
+                        regions = [
+                            f"{name} {'✓' if user_game[owned] else '✗'}"
+                            for name, flag, owned, _ in REGION_LABELS if getattr(game, flag)
+                        ]
+                        click.echo(f"Updated: {game.title} ({', '.join(regions)})")
+                    else:
+                        # Multiple matches found - add to unmatched for manual processing
+                        unmatched_files.append(file_path)
+                        click.echo(f"Multiple matches found for: {filename} (will prompt for manual matching)")
                 else:
-                    # Multiple matches found - add to unmatched for manual processing
                     unmatched_files.append(file_path)
-                    click.echo(f"Multiple matches found for: {filename} (will prompt for manual matching)")
-            else:
-                unmatched_files.append(file_path)
-                click.echo(f"No match found for: {filename}")
+                    click.echo(f"No match found for: {filename}")
+            
+            # Write all collection changes as two batched statements
+            user_db.bulk_insert_mappings(UserGame, new_user_games)
+            user_db.bulk_update_mappings(UserGame, list(updated_user_games.values()))
         
-        user_db.commit()
         click.echo("\nAutomatic scan completed!")
         
         # Handle manual matching for unmatched files
@@ -428,5 +635,18 @@ def scan(directory):
         game_db.close()
         user_db.close()
 
+@main.command('build-search-index', hidden=True)
+@click.argument('database', type=click.Path(exists=True, dir_okay=False))
+def build_search_index(database):
+    """(Re)build the games_fts index in a game database before shipping it"""
+    engine = create_engine(f"sqlite:///{database}")
+    try:
+        with engine.begin() as conn:
+            for statement in GAMES_FTS_DROP + GAMES_FTS_SCHEMA:
+                conn.execute(text(statement))
+    finally:
+        engine.dispose()
+    click.echo(f"Built search index in {database}")
+
 if __name__ == '__main__':
     main() 
\ No newline at end of file